@@ -1,18 +1,47 @@
 from __future__ import annotations
 import argparse
-import csv
 import json
+import mmap
+import os
+import stat
 import sys
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import SEEK_END
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
 
 FieldsTuple = Tuple[str, ...]
-MappingIndex = Dict[FieldsTuple, Dict[str, Tuple[str, str]]]
+MappingTable = Dict[str, Tuple[str, str]]
+MappingIndex = Dict[FieldsTuple, MappingTable]
+ShardResult = Tuple[Optional[str], Dict[str, List[Dict[str, object]]], int]
+# (brand or None, {article_number: (variations, encoded variations)}, processed rows).
+EncodedShard = Tuple[Optional[str], Dict[str, Tuple[int, str]], int]
+# (brand, {article_number: encoded variations}, variations).
+EncodedCatalog = Tuple[str, Dict[str, str], int]
+KeyFn = Callable[[List[str]], str]
+# (first col_idx, its possible values or None, key_fn, consumed col_idxs, table).
+MappingGroup = Tuple[int, Optional[FrozenSet[str]], KeyFn, FrozenSet[int], MappingTable]
+CopyColumn = Tuple[int, str, bool]  # (col_idx, name, is_numeric).
+# (mapped {destination_type: destination} fields, columns left to copy).
+ResolvedMappings = Tuple[Dict[str, str], List[CopyColumn]]
 CombineSpec = Tuple[Tuple[str, ...], str, str]
 NUMERIC_FIELDS = {"price_buy_net", "price_buy_gross", "price_sell", "discount_rate"}
+# Low-cardinality pricat columns (same few values on every row).
+INTERN_FIELDS = {
+    "brand", "season", "currency", "supplier", "collection",
+    "article_structure_code", "size_group_code", "size_code", "color_code",
+}
+RESOLVED_CACHE_MAX = 1 << 16  # Bound on memoized mapping combinations per pricat.
+NUMBERS_CACHE_MAX = 1 << 16  # Bound on memoized numeric texts per pricat.
+READ_CHUNK_BYTES = 1 << 20  # Bytes decoded and split per step by read_csv_rows.
+# Smaller pricats are faster to transform in-process: 8 MiB is ~0.7s of sequential work, while
+# starting a worker costs ~0.03s with "fork" and ~0.15s with "spawn" (macOS/Windows default).
+PARALLEL_MIN_BYTES = 8 << 20
 
 
 @dataclass(frozen=True)
@@ -21,6 +50,8 @@ class CliArgs:
     mappings: str
     output: str
     combine: Optional[List[str]] = None
+    compact: bool = False
+    workers: int = 1
 
 # BONUS - Combine fields.
 def parse_combine_specs(raw_specs: Optional[List[str]]) -> List[CombineSpec]:
@@ -86,29 +117,151 @@ def apply_combine_specs(variation: Dict[str, object], row: Dict[str, str], specs
 
 
 # Read CSV.
-def read_csv_rows(path: str, delimiter: str = ";") -> Iterable[Dict[str, str]]:
+def read_csv_rows(path: str, delimiter: str = ";", intern_fields: Iterable[str] = (),
+                  byte_range: Optional[Tuple[int, int]] = None) -> Tuple[List[str], Iterator[List[str]]]:
     """
-    Read the CSV and return a dict-iterator.
+    Read the CSV and return (fieldnames, rows-iterator).
+
+    Each row is a list of cells aligned with fieldnames (short rows are padded with "").
+    Lines are split on the delimiter directly: quoted fields and rows longer than the
+    header are rejected with ValueError.
+    Values of 'intern_fields' columns are sys.intern'ed (one shared str per distinct value).
+    'byte_range' (start, end) limits rows to the lines starting in that range (see shard_byte_ranges).
+    Regular files are memory-mapped; other inputs (pipes, FIFOs) are read once, up front.
     """
-    with open(path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f, delimiter=delimiter)
+    with open(path, "rb") as f:
+        header = f.readline().decode("utf-8").rstrip("\r\n")
+        if stat.S_ISREG(os.fstat(f.fileno()).st_mode):
+            data_start, data = f.tell(), None
+        else:
+            # Not seekable, mappable or reopenable: keep what follows the header.
+            if byte_range is not None:
+                raise ValueError(f"byte_range needs a regular file: {path}")  # Validation.
+            data_start, data = 0, f.read()
+    if not header:
+        raise ValueError(f"No headers: {path}")  # Validation: columns exist.
+    if '"' in header:
+        raise ValueError(f"Quoted fields are not supported: {path}: {header!r}")  # Validation.
+
+    fieldnames = header.split(delimiter)
+    to_intern = set(intern_fields)
+    intern_idxs = [i for i, name in enumerate(fieldnames) if name in to_intern]
+
+    start, end = byte_range if byte_range is not None else (data_start, None)
+
+    def split_rows(buf: Union[mmap.mmap, bytes], stop: int) -> Iterator[List[str]]:
+        n_fields = len(fieldnames)
+        _intern = sys.intern
+        for text in _text_chunks(buf, start, stop, READ_CHUNK_BYTES):
+            if '"' in text:  # One scan per chunk; the line is only looked up to report it.
+                line = next(line for line in text.split("\n") if '"' in line)
+                raise ValueError(f"Quoted fields are not supported: {path}: {line!r}")  # Validation.
+
+            # Whole chunk split into lines in C.
+            for line in text.split("\n"):
+                if not line:  # skip blank lines.
+                    continue
+
+                cells = line.split(delimiter)
+                if len(cells) != n_fields:
+                    if len(cells) > n_fields:
+                        raise ValueError(
+                            f"More cells than header columns ({n_fields}): {path}: {line!r}"
+                        )  # Validation.
+                    cells.extend([""] * (n_fields - len(cells)))
+                for i in intern_idxs:
+                    cells[i] = _intern(cells[i])
+                yield cells  # yield to return iterator.
+
+    def rows() -> Iterator[List[str]]:
+        if data is not None:
+            yield from split_rows(data, len(data))
+            return
+
+        # The file is only opened once iteration starts (an unused iterator holds nothing open).
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield from split_rows(mm, len(mm) if end is None else min(end, len(mm)))
+
+    return fieldnames, rows()
+
+
+def _text_chunks(mm: Union[mmap.mmap, bytes], pos: int, end: int,
+                 chunk_size: int = READ_CHUNK_BYTES) -> Iterator[str]:
+    """
+    Decode mm[pos:end] in chunks of about chunk_size bytes, each ending on a line boundary
+    (so no line or UTF-8 sequence is ever cut). "\r\n" line endings are normalized to "\n".
+    """
+    while pos < end:
+        stop = pos + chunk_size
+        if stop >= end:
+            stop = end
+        else:
+            nl = mm.rfind(b"\n", pos, stop)
+            if nl < 0:  # a line longer than chunk_size.
+                nl = mm.find(b"\n", stop, end)
+            stop = nl + 1 if nl >= 0 else end
 
-        if reader.fieldnames is None:
-            raise ValueError(f"No headers: {path}")  # Validation: columns exist.
+        text = mm[pos:stop].decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        yield text
+        pos = stop
 
-        for row in reader:
-            yield {k: (v if v is not None else "") for k, v in row.items()}  # yield to return iterator.
+
+def shard_byte_ranges(path: str, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split the data lines of a CSV (header excluded) into up to n_shards (start, end) byte ranges.
+    Every boundary is moved forward to the start of a line.
+    """
+    with open(path, "rb") as f:
+        f.readline()  # header.
+        data_start = f.tell()
+        size = f.seek(0, SEEK_END)
+
+        bounds = [data_start]
+        for k in range(1, n_shards):
+            target = data_start + (size - data_start) * k // n_shards
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # finish the line that contains the target byte.
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def column_index(fieldnames: List[str]) -> Dict[str, int]:
+    """
+    Map each column name to its position in a row.
+    """
+    return {name: i for i, name in enumerate(fieldnames)}
 
 
 # Mapping index.
 def load_mappings_index(mappings_csv_path: str) -> MappingIndex:
     idx: MappingIndex = defaultdict(dict)
 
-    for r in read_csv_rows(mappings_csv_path, delimiter=";"):
-        source_type_raw = r.get("source_type", "").strip()
-        source = r.get("source", "").strip()
-        dest_type = r.get("destination_type", "").strip()
-        dest_value = r.get("destination", "").strip()
+    fieldnames, rows = read_csv_rows(mappings_csv_path, delimiter=";")
+    col_idx = column_index(fieldnames)
+
+    for name in ("source_type", "source", "destination_type", "destination"):
+        if name not in col_idx:
+            raise ValueError(f"Mappings file without '{name}' column: {mappings_csv_path}")  # Validation.
+
+    source_type_i = col_idx["source_type"]
+    source_i = col_idx["source"]
+    dest_type_i = col_idx["destination_type"]
+    dest_value_i = col_idx["destination"]
+
+    for r in rows:
+        source_type_raw = r[source_type_i].strip()
+        source = r[source_i].strip()
+        dest_type = r[dest_type_i].strip()
+        dest_value = r[dest_value_i].strip()
 
         if not source_type_raw or not dest_type:  # Validation.
             raise ValueError(f"Mapping row invalid (source_type/destination_type empty): {r}")
@@ -117,115 +270,259 @@ def load_mappings_index(mappings_csv_path: str) -> MappingIndex:
         if not fields:
             raise ValueError(f"Mapping row invalid (empty fields): {r}")  # Validation.
 
-        idx[fields][source] = (dest_type, dest_value)
+        # Interned source keys let lookups with interned pricat values match by identity.
+        idx[fields][sys.intern(source)] = (dest_type, dest_value)
 
     return idx
 
 
-# Transformer: pricat row to variation.
-def row_to_variation(row: Dict[str, str], mappings_idx: MappingIndex) -> Dict[str, str]:
+# Mapping plan: mappings_idx + header resolved once into per-column work.
+@dataclass(frozen=True)
+class MappingPlan:
+    fieldnames: Tuple[str, ...]  # header the plan was compiled for.
+    groups: List[MappingGroup]  # in mappings_idx order.
+    columns: List[CopyColumn]  # every column except brand.
+    # Row -> values of every mapping input column (the only cells mapping results depend on).
+    input_key: Callable[[List[str]], object]
+    # input_key -> resolved mappings (catalog rows repeat a few season/size/color combinations).
+    resolved: Dict[object, ResolvedMappings] = field(default_factory=dict)
+    # Numeric field text -> converted value (prices repeat a lot: each distinct text is parsed once).
+    numbers: Dict[str, object] = field(default_factory=dict)
+
+
+def to_number(v: str) -> object:
     """
-    - applies all mapping rules (including combined-field mappings).
-    - copies the remaining fields "as is" (except for brand).
-    - avoids copying fields that were "consumed" by combined mappings.
-    - converts known numeric fields to float.
+    float(v) when parseable, else v unchanged.
+    """
+    try:
+        return float(v)
+    except ValueError:
+        return v
 
-    Returns a dict representing one variation.
+
+def compile_key_fn(idxs: Tuple[int, ...]) -> KeyFn:
     """
+    Build a function returning the "|"-joined lookup key of a mapping group for a row,
+    e.g. (11, 12) -> lambda c: c[11] + "|" + c[12]. -1 marks a field missing from the header ("").
+    """
+    parts = [f"c[{i}]" if i >= 0 else '""' for i in idxs]
+    return eval("lambda c: " + ' + "|" + '.join(parts), {"__builtins__": {}})  # only ints are formatted in.
+
+
+def first_field_values(table: MappingTable) -> FrozenSet[str]:
+    """
+    Values the first field of a combined group can take for a hit.
+
+    Every prefix of a source key that ends right before a "|" is included,
+    so a first field value that itself contains "|" is never filtered out by mistake.
+    """
+    values = set()
+    for key in table:
+        pos = key.find("|")
+        while pos >= 0:
+            values.add(key[:pos])
+            pos = key.find("|", pos + 1)
+    return frozenset(values)
+
+
+def consumed_columns(groups: List[MappingGroup]) -> FrozenSet[int]:
+    """
+    Columns any mapping group can consume.
+    """
+    return frozenset(i for _, _, _, idxs, _ in groups for i in idxs)
 
-    variation: Dict[str, str] = {}  # Base.
-    consumed_input_fields = set()  # Save used inputs to avoid duplications.
 
-    # Apply mappings:
+def compile_mapping_plan(mappings_idx: MappingIndex, fieldnames: List[str]) -> MappingPlan:
+    """
+    Precompute the per-row mapping work for a given header (built once, reused for every row).
+    """
+    col_idx = column_index(fieldnames)
+
+    groups: List[MappingGroup] = []
     for fields_tuple, table in mappings_idx.items():
-        # Get values for each field from the row (if missing, then "")
-        values = [row.get(field_name, "") for field_name in fields_tuple]
-        joined = "|".join(values)
+        idxs = tuple(col_idx.get(f, -1) for f in fields_tuple)
+
+        prefixes: Optional[FrozenSet[str]] = None
+        if len(idxs) > 1:
+            prefixes = first_field_values(table)
+            if idxs[0] < 0:  # first field missing from the header: its value is always "".
+                if "" not in prefixes:
+                    continue  # the group can never hit.
+                prefixes = None
+        groups.append((idxs[0], prefixes, compile_key_fn(idxs), frozenset(i for i in idxs if i >= 0), table))
+
+    input_cols = sorted(consumed_columns(groups))
+    input_key: Callable[[List[str]], object] = itemgetter(*input_cols) if input_cols else (lambda c: None)
+
+    columns = [
+        (i, name, name in NUMERIC_FIELDS)
+        for i, name in enumerate(fieldnames)
+        if name != "brand"  # brand belongs to catalog level, not variation.
+    ]
+    return MappingPlan(fieldnames=tuple(fieldnames), groups=groups, columns=columns, input_key=input_key)
+
+
+# Transformer: pricat row to variation.
+def resolve_mappings(cells: List[str], plan: MappingPlan) -> ResolvedMappings:
+    """
+    Apply the mapping rules to a row:
+    - returns the {destination_type: destination} writes, in mapping group order
+      (shared between rows: copy it before adding fields).
+    - plus the columns left to copy (inputs of mappings that hit are consumed).
+    """
+    mapped: Dict[str, str] = {}
+    consumed = set()  # Save used inputs to avoid duplications.
+
+    for first_i, prefixes, key_fn, idxs, table in plan.groups:
+        if prefixes is not None and cells[first_i] not in prefixes:
+            continue  # no source key starts with this value: skip building the key.
 
         # Exact lookup against source.
-        hit = table.get(joined)
+        hit = table.get(key_fn(cells))
         if hit is None:
             continue
 
-        dest_type, dest_value = hit
-
         # If multiple rules write the same destination_type, the last one would win.
-        variation[dest_type] = dest_value  # Write the output field.
+        mapped[hit[0]] = hit[1]  # Write the output field.
+        consumed.update(idxs)  # Mark input fields as consumed.
 
-        # Mark input fields as consumed.
-        for f in fields_tuple:
-            consumed_input_fields.add(f)
+    copy_columns = [col for col in plan.columns if col[0] not in consumed]
+    return mapped, copy_columns
 
-    # Copy the rest of the fields.
-    for k, v in row.items():
-        if k == "brand":  # brand belongs to catalog level, not variation.
-            continue
-        if k in consumed_input_fields:  # don't copy inputs that were already used by mappings.
-            continue
-        if v == "" or v is None:  # skip empties.
+
+def cells_to_variation(cells: List[str], plan: MappingPlan) -> Dict[str, object]:
+    """
+    Row (cells aligned with the plan's header) -> variation:
+    - mapping results are resolved once per distinct combination of mapping input values.
+    - the remaining columns are skipped (empty), converted to float (known numeric fields)
+      or copied "as is".
+    """
+    key = plan.input_key(cells)
+    resolved = plan.resolved.get(key)
+    if resolved is None:
+        resolved = resolve_mappings(cells, plan)
+        if len(plan.resolved) < RESOLVED_CACHE_MAX:
+            plan.resolved[key] = resolved
+
+    mapped, copy_columns = resolved
+    variation: Dict[str, object] = mapped.copy()  # Base: shared mapped-fields dict, copied in one C call.
+    numbers = plan.numbers
+
+    for i, name, is_numeric in copy_columns:
+        v = cells[i]
+        if not v:  # skip empties.
             continue
 
         # Convert numeric fields (prices, discount) to float when possible.
-        if k in NUMERIC_FIELDS:
-            try:
-                variation[k] = float(v)
-            except ValueError:
-                variation[k] = v
+        if is_numeric:
+            num = numbers.get(v)
+            if num is None:
+                num = to_number(v)
+                if len(numbers) < NUMBERS_CACHE_MAX:
+                    numbers[v] = num
+            variation[name] = num
             continue
 
-        variation[k] = v  # Copy the raw field.
+        variation[name] = v  # Copy the raw field.
 
     return variation
 
 
+def row_to_variation(row: Dict[str, str], mappings_idx: MappingIndex,
+                     plan: Optional[MappingPlan] = None) -> Dict[str, object]:
+    """
+    - applies all mapping rules (including combined-field mappings).
+    - copies the remaining fields "as is" (except for brand).
+    - avoids copying fields that were "consumed" by combined mappings.
+    - converts known numeric fields to float.
+
+    Dict-row convenience wrapper around cells_to_variation.
+    Pass 'plan' (compile_mapping_plan(mappings_idx, list(row))) when converting many rows
+    with the same keys; otherwise a plan is compiled for this call.
+    Returns a dict representing one variation.
+    """
+    if plan is None:
+        plan = compile_mapping_plan(mappings_idx, list(row))
+    elif plan.fieldnames != tuple(row):
+        raise ValueError(f"Mapping plan compiled for other fields: {plan.fieldnames} vs {tuple(row)}")  # Validation.
+
+    cells = list(row.values())
+    if None in cells:  # rebuild only when there is a missing value to normalize.
+        cells = [v if v is not None else "" for v in cells]
+    return cells_to_variation(cells, plan)
+
+
 # Generate catalog by articles.
-def build_catalog_from_pricat(pricat_csv_path: str, mappings_idx: MappingIndex,
-                              combine_specs: Optional[List[CombineSpec]] = None,) -> Tuple[Dict, int]:
+def group_pricat_variations(pricat_csv_path: str, mappings_idx: MappingIndex,
+                            combine_specs: Optional[List[CombineSpec]] = None,
+                            byte_range: Optional[Tuple[int, int]] = None) -> ShardResult:
     """
-    Generate final JSON + return total of processed rows.
+    Transform pricat rows (optionally only a byte range of them) into variations.
+    Returns (brand or None if no rows, variations grouped by article_number, processed rows).
     """
-    articles_by_number: Dict[str, Dict] = {}
+    variations_by_article: Dict[str, List[Dict[str, object]]] = defaultdict(list)
     catalog_brand: Optional[str] = None
     rows_processed = 0
 
-    for row in read_csv_rows(pricat_csv_path, delimiter=";"):
+    fieldnames, rows = read_csv_rows(pricat_csv_path, delimiter=";", intern_fields=INTERN_FIELDS,
+                                     byte_range=byte_range)
+    col_idx = column_index(fieldnames)
+    plan = compile_mapping_plan(mappings_idx, fieldnames)  # Mapping work hoisted out of the row loop.
+    brand_i = col_idx.get("brand")
+    article_number_i = col_idx.get("article_number")
+
+    # Row fields referenced by --combine specs, resolved to positions once (each field read once per row).
+    combine_fields = {f for fields, _, _ in combine_specs or [] for f in fields}
+    combine_cols = [(name, col_idx[name]) for name in combine_fields if name in col_idx]
+
+    for cells in rows:
         rows_processed += 1
-        row_brand = row.get("brand", "")
+        row_brand = cells[brand_i] if brand_i is not None else ""
 
-        if catalog_brand is None:
-            catalog_brand = row_brand
-        else:
-            # It assumes the brand is the same for all rows.
-            if row_brand != catalog_brand:
+        # It assumes the brand is the same for all rows (first row sets it).
+        if row_brand != catalog_brand:
+            if catalog_brand is not None:
                 raise ValueError(
                     f"Inconsistent brand in pricat: catalog_brand='{catalog_brand}' vs row_brand='{row_brand}'"
                 )  # Validation.
+            catalog_brand = row_brand
 
         # Group by article_number.
-        article_number = row.get("article_number", "")
+        article_number = cells[article_number_i] if article_number_i is not None else ""
         if not article_number:
-            raise ValueError(f"pricat row without article_number: {row}")  # Validation.
+            raise ValueError(f"pricat row without article_number: {cells}")  # Validation.
 
         # Row -> variation.
-        variation = row_to_variation(row, mappings_idx)
+        variation = cells_to_variation(cells, plan)
+
+        if combine_specs:  # Apply combination of fields.
+            combine_row = {name: cells[i] for name, i in combine_cols}
+            apply_combine_specs(variation, combine_row, combine_specs)
+
+        # Add variations (the article's list is created on first sight).
+        variations_by_article[article_number].append(variation)
 
-        apply_combine_specs(variation, row, combine_specs or [])  # Apply combination of fields.
+    return catalog_brand, variations_by_article, rows_processed
 
-        # Create article if it doesn't exist.
-        if article_number not in articles_by_number:
-            articles_by_number[article_number] = {
-                "article_number": article_number,
-                "variations": [],
-            }
 
-        # Add variations.
-        articles_by_number[article_number]["variations"].append(variation)
+def build_catalog_from_pricat(pricat_csv_path: str, mappings_idx: MappingIndex,
+                              combine_specs: Optional[List[CombineSpec]] = None) -> Tuple[Dict, int]:
+    """
+    Generate final JSON + return total of processed rows.
+    """
+    catalog_brand, variations_by_article, rows_processed = group_pricat_variations(
+        pricat_csv_path, mappings_idx, combine_specs
+    )
 
     # If the CSV is empty, catalog_brand is None.
     if catalog_brand is None:
         catalog_brand = ""
 
-    articles_list = list(articles_by_number.values())  # article dict to list.
+    # Article objects are built once, in first-seen order.
+    articles_list = [
+        {"article_number": article_number, "variations": variations}
+        for article_number, variations in variations_by_article.items()
+    ]
 
     # Final structure.
     result = {
@@ -238,10 +535,86 @@ def build_catalog_from_pricat(pricat_csv_path: str, mappings_idx: MappingIndex,
     return result, rows_processed
 
 
+# Parallel build.
+def use_workers(pricat_csv_path: str, workers: int) -> bool:
+    """
+    True when the pricat is split across worker processes: workers > 1 and a regular file
+    of at least PARALLEL_MIN_BYTES.
+    """
+    st = Path(pricat_csv_path).stat()
+    return workers > 1 and stat.S_ISREG(st.st_mode) and st.st_size >= PARALLEL_MIN_BYTES
+
+
+def encode_pricat_shard(pricat_csv_path: str, mappings_idx: MappingIndex,
+                        combine_specs: Optional[List[CombineSpec]], byte_range: Tuple[int, int],
+                        indent: Optional[int]) -> EncodedShard:
+    """
+    Worker side of build_encoded_catalog: transform a byte range of the pricat and JSON-encode
+    each article's variations there, so only text is sent back to the parent process.
+    Returns (brand or None if no rows, {article_number: (variations, encoded variations)}, processed rows).
+    """
+    catalog_brand, variations_by_article, rows_processed = group_pricat_variations(
+        pricat_csv_path, mappings_idx, combine_specs, byte_range
+    )
+    encode_items = _variations_items_encoder(indent)
+    encoded = {
+        article_number: (len(variations), encode_items(variations))
+        for article_number, variations in variations_by_article.items()
+    }
+    return catalog_brand, encoded, rows_processed
+
+
+def build_encoded_catalog(pricat_csv_path: str, mappings_idx: MappingIndex,
+                          combine_specs: Optional[List[CombineSpec]] = None,
+                          indent: Optional[int] = 2, workers: int = 2) -> Tuple[EncodedCatalog, int]:
+    """
+    Multi-process build_catalog_from_pricat, already encoded for write_encoded_catalog_json
+    (with the same indent): byte-range shards are transformed and encoded by worker processes,
+    then merged in file order. Returns (catalog, total of processed rows).
+    """
+    items_by_article: Dict[str, List[str]] = {}
+    catalog_brand: Optional[str] = None
+    rows_processed = 0
+    total_variations = 0
+
+    ranges = shard_byte_ranges(pricat_csv_path, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        shards = executor.map(
+            encode_pricat_shard,
+            repeat(pricat_csv_path), repeat(mappings_idx), repeat(combine_specs), ranges, repeat(indent),
+        )
+
+        # Merge shards in file order (same articles/variations order as a sequential run).
+        for shard_brand, shard_articles, shard_rows in shards:
+            rows_processed += shard_rows
+
+            if shard_brand is not None and shard_brand != catalog_brand:
+                if catalog_brand is not None:
+                    raise ValueError(
+                        f"Inconsistent brand in pricat: catalog_brand='{catalog_brand}' vs row_brand='{shard_brand}'"
+                    )  # Validation.
+                catalog_brand = shard_brand
+
+            for article_number, (n_variations, items) in shard_articles.items():
+                total_variations += n_variations
+                parts = items_by_article.get(article_number)
+                if parts is None:
+                    items_by_article[article_number] = [items]
+                else:
+                    parts.append(items)
+
+    # Articles split across shards: their encoded variations are joined like list items.
+    sep = _variations_items_separator(indent)
+    encoded_articles = {article_number: sep.join(parts) for article_number, parts in items_by_article.items()}
+
+    # If the CSV is empty, catalog_brand is None.
+    return (catalog_brand or "", encoded_articles, total_variations), rows_processed
+
+
 # Validations.
 def basic_validations(result: Dict, rows_processed: int) -> None:
     """
-    - All rows were processed.
+    - All rows were processed (O(articles): variation lists are counted, not walked).
     - JSON structure.
     """
 
@@ -261,13 +634,184 @@ def basic_validations(result: Dict, rows_processed: int) -> None:
             raise AssertionError("Some 'article.variations' are not a list.")
         total_variations += len(vars_list)
 
+    _check_rows_vs_variations(rows_processed, total_variations)
+
+
+def encoded_validations(catalog: EncodedCatalog, rows_processed: int) -> None:
+    """
+    - All rows were processed (variations are counted by the workers that encoded them).
+    """
+    _, _, total_variations = catalog
+    _check_rows_vs_variations(rows_processed, total_variations)
+
+
+def _check_rows_vs_variations(rows_processed: int, total_variations: int) -> None:
     if total_variations != rows_processed:
         raise AssertionError(
             f"Mismatch rows vs variations: rows_processed={rows_processed}, total_variations={total_variations}"
         )
 
 
+# JSON output.
+def write_catalog_json(result: Dict, f: TextIO, indent: Optional[int] = 2) -> None:
+    """
+    Stream the catalog to 'f' one article at a time.
+
+    Output is identical to json.dump(result, f, ensure_ascii=False, indent=indent).
+    indent=None writes compact JSON (handled by the C encoder, much faster).
+    """
+    catalog = result["catalog"]
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)  # one encoder for every article.
+
+    if indent is None:
+        article_texts = map(encoder.encode, catalog["articles"])
+    else:
+        article_texts = map(_indented_article_encoder(encoder, indent), catalog["articles"])
+    _write_catalog(f, encoder.encode(catalog["brand"]), article_texts, indent)
+
+
+def write_encoded_catalog_json(catalog: EncodedCatalog, f: TextIO, indent: Optional[int] = 2) -> None:
+    """
+    Write a build_encoded_catalog catalog (built with the same indent).
+
+    Output is identical to write_catalog_json of the same pricat built by build_catalog_from_pricat.
+    """
+    catalog_brand, encoded_articles, _ = catalog
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    article_texts = (
+        _article_text(encode(article_number), items, indent)
+        for article_number, items in encoded_articles.items()
+    )
+    _write_catalog(f, encode(catalog_brand), article_texts, indent)
+
+
+def _write_catalog(f: TextIO, brand: str, article_texts: Iterable[str], indent: Optional[int]) -> None:
+    """
+    Write the catalog object around already encoded brand and articles (3 levels deep).
+    """
+    if indent is None:
+        f.write('{"catalog": {"brand": ' + brand + ', "articles": [')
+        first = True
+        for text in article_texts:
+            f.write(("" if first else ", ") + text)
+            first = False
+        f.write("]}}")
+        return
+
+    pad = " " * indent
+    f.write("{\n" + pad + '"catalog": {\n' + pad * 2 + '"brand": ' + brand + ",\n" + pad * 2 + '"articles": [')
+    first = True
+    for text in article_texts:
+        f.write(("\n" if first else ",\n") + pad * 3 + text)
+        first = False
+    f.write(("]" if first else "\n" + pad * 2 + "]") + "\n" + pad + "}\n}")
+
+
+_SCALAR_TYPES = frozenset({str, float, int, bool, type(None)})
+
+
+def _flat_values(variations: List[Dict]) -> bool:
+    """
+    True when every variation is a dict holding only scalar values (no nested dict/list).
+    """
+    types = set()
+    for variation in variations:
+        if type(variation) is not dict:
+            return False
+        types.update(map(type, variation.values()))  # collected in C, one call per variation.
+    return types <= _SCALAR_TYPES
+
+
+def _indented_article_encoder(encoder: json.JSONEncoder, indent: int) -> Callable[[Dict], str]:
+    """
+    Article (3 levels deep in the catalog) -> indented JSON text.
+
+    Articles of any other shape than {"article_number": scalar, "variations": list}
+    fall back to the (pure Python) indented encoder.
+    """
+    pad = " " * indent
+    encode_items = _variations_items_encoder(indent)
+
+    def encode(article: Dict) -> str:
+        variations = article.get("variations")
+        if list(article) != ["article_number", "variations"] or not isinstance(variations, list) \
+                or type(article["article_number"]) not in _SCALAR_TYPES:
+            return encoder.encode(article).replace("\n", "\n" + pad * 3)
+
+        return _article_text(encoder.encode(article["article_number"]), encode_items(variations), indent)
+
+    return encode
+
+
+def _variations_items_encoder(indent: Optional[int]) -> Callable[[List[Dict]], str]:
+    """
+    Article variations -> JSON text of the list items (without the brackets and the line breaks
+    around them), as written for an article 3 levels deep in the catalog.
+
+    The stdlib only uses its C encoder without indent, so a whole variations list is encoded
+    in one C call with the indented field separator, then the separators between variations
+    are fixed up. JSON strings never contain raw newlines, so the fix-up only ever matches
+    the boundary between two variations.
+    Empty or nested (non-scalar) variations fall back to the (pure Python) indented encoder.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+    if indent is None:
+        return lambda variations: encoder.encode(variations)[1:-1]  # strip "[" and "]".
+
+    pad = " " * indent
+    field_sep = ",\n" + pad * 6
+    encode_flat = json.JSONEncoder(ensure_ascii=False, separators=(field_sep, ": ")).encode
+    between = "\n" + pad * 5 + "},\n" + pad * 5 + "{\n" + pad * 6
+
+    def encode(variations: List[Dict]) -> str:
+        if not variations:
+            return ""
+        if not all(variations) or not _flat_values(variations):
+            text = encoder.encode(variations).replace("\n", "\n" + pad * 4)
+            return text[2 + len(pad) * 5:-2 - len(pad) * 4]  # strip "[\n" + pad * 5 and "\n" + pad * 4 + "]".
+
+        body = encode_flat(variations)[2:-2].replace("}" + field_sep + "{", between)  # strip "[{" and "}]".
+        return "{\n" + pad * 6 + body + "\n" + pad * 5 + "}"
+
+    return encode
+
+
+def _variations_items_separator(indent: Optional[int]) -> str:
+    """
+    Separator between two variations as written by _variations_items_encoder.
+    """
+    return ", " if indent is None else ",\n" + " " * indent * 5
+
+
+def _article_text(article_number: str, items: str, indent: Optional[int]) -> str:
+    """
+    Article JSON text from its encoded article_number and variations items (3 levels deep).
+    """
+    if indent is None:
+        return '{"article_number": ' + article_number + ', "variations": [' + items + "]}"
+
+    pad = " " * indent
+    variations = "[\n" + pad * 5 + items + "\n" + pad * 4 + "]" if items else "[]"
+    return (
+        "{\n" + pad * 4 + '"article_number": ' + article_number
+        + ",\n" + pad * 4 + '"variations": ' + variations + "\n" + pad * 3 + "}"
+    )
+
+
 # CLI.
+def positive_int(value: str) -> int:
+    """
+    argparse type: an integer >= 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {value!r}")  # Validation.
+    return number
+
+
 def parse_args(argv: Optional[List[str]] = None) -> CliArgs:
     """
     Argument parser for the CLI.
@@ -289,6 +833,17 @@ def parse_args(argv: Optional[List[str]] = None) -> CliArgs:
             "Example: --combine price_buy_net,currency:price_buy_net_currency:' '"
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Worker processes used to transform large pricat files (default: 1).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write compact JSON (no indentation). Faster and smaller for large catalogs.",
+    )
 
     ns = parser.parse_args(argv)
     return CliArgs(
@@ -296,6 +851,8 @@ def parse_args(argv: Optional[List[str]] = None) -> CliArgs:
         mappings=ns.mappings,
         output=ns.output,
         combine=ns.combine,
+        compact=ns.compact,
+        workers=ns.workers,
     )
 
 
@@ -316,11 +873,17 @@ def main(argv: Optional[List[str]] = None) -> int:
     # 1) Load mappings.
     mappings_idx = load_mappings_index(args.mappings)
 
-    # 2) Build catalog.
-    result, rows_processed = build_catalog_from_pricat(args.pricat, mappings_idx, combine_specs=combine_specs)
-
-    # 3) Basic validations.
-    basic_validations(result, rows_processed)
+    # 2) Build catalog + 3) basic validations.
+    indent = None if args.compact else 2
+    parallel = use_workers(args.pricat, args.workers)
+    if parallel:
+        catalog, rows_processed = build_encoded_catalog(
+            args.pricat, mappings_idx, combine_specs=combine_specs, indent=indent, workers=args.workers
+        )
+        encoded_validations(catalog, rows_processed)
+    else:
+        result, rows_processed = build_catalog_from_pricat(args.pricat, mappings_idx, combine_specs=combine_specs)
+        basic_validations(result, rows_processed)
 
     # 4) Generate JSON output.
     out_path = Path(args.output)
@@ -329,7 +892,10 @@ def main(argv: Optional[List[str]] = None) -> int:
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+        if parallel:
+            write_encoded_catalog_json(catalog, f, indent=indent)
+        else:
+            write_catalog_json(result, f, indent=indent)
 
     return 0
 
@@ -1,16 +1,24 @@
 # Run:
 #   python -m unittest -v
 
+import io
 import json
 import os
 import tempfile
 import textwrap
+import threading
 import unittest
+from unittest import mock
+
+from src import transform
 
 from src.transform import (
+    compile_mapping_plan,
+    read_csv_rows,
     load_mappings_index,
     row_to_variation,
     build_catalog_from_pricat,
+    write_catalog_json,
 )
 
 
@@ -56,6 +64,83 @@ class TestTransform(unittest.TestCase):
         self.assertEqual(variation["ean"], "123")
         self.assertNotIn("brand", variation)
 
+    def test_row_to_variation_overlapping_destinations(self) -> None:
+        """
+        Two rules writing the same destination_type:
+        - the last mapping group wins
+        - inputs of both groups are consumed (not copied as raw fields)
+        """
+        mappings_idx = {
+            ("size_code",): {
+                "38": ("size", "38"),
+            },
+            ("size_group_code", "size_code"): {
+                "EU|38": ("size", "European size 38"),
+            },
+        }
+
+        row = {
+            "brand": "Via Vai",
+            "size_group_code": "EU",
+            "size_code": "38",
+            "ean": "123",
+        }
+
+        variation = row_to_variation(row, mappings_idx)
+
+        self.assertEqual(variation, {"size": "European size 38", "ean": "123"})
+
+    def test_row_to_variation_last_rule_wins_in_mapping_order(self) -> None:
+        """
+        Rules are applied in mappings.csv order, regardless of how many fields they use:
+        a single-field rule listed after a combined one overwrites it (and keeps its key position).
+        """
+        mappings_idx = {
+            ("size_group_code", "size_code"): {
+                "EU|38": ("size", "combined"),
+            },
+            ("size_code",): {
+                "38": ("size", "single"),
+            },
+            ("season",): {
+                "winter": ("season", "Winter"),
+            },
+        }
+
+        row = {
+            "brand": "Via Vai",
+            "season": "winter",
+            "size_group_code": "EU",
+            "size_code": "38",
+            "ean": "123",
+        }
+
+        variation = row_to_variation(row, mappings_idx)
+
+        self.assertEqual(variation, {"size": "single", "season": "Winter", "ean": "123"})
+        self.assertEqual(list(variation), ["size", "season", "ean"])
+
+    def test_row_to_variation_raw_field_named_like_mapped_destination(self) -> None:
+        """
+        Mapped fields are written before the raw copy:
+        a raw column that shares its name with a mapping destination (and is not consumed) wins.
+        """
+        mappings_idx = {
+            ("price_sell",): {
+                "a": ("ean", "Y"),
+            }
+        }
+
+        row = {
+            "ean": "111",
+            "article_number": "A",
+            "price_sell": "a",
+        }
+
+        variation = row_to_variation(row, mappings_idx)
+
+        self.assertEqual(variation, {"ean": "111", "article_number": "A"})
+
     def test_row_to_variation_simple_mapping(self) -> None:
         """
         Simple mapping example:
@@ -82,6 +167,50 @@ class TestTransform(unittest.TestCase):
         self.assertEqual(variation["season"], "Winter")
         self.assertNotIn("brand", variation)
 
+    def test_row_to_variation_skips_empty_fields(self) -> None:
+        """
+        Variations only carry the fields a row actually has:
+        empty cells are omitted (no None / "" placeholders), so keys differ between rows.
+        """
+        mappings_idx = {}
+
+        row = {
+            "brand": "Via Vai",
+            "article_number": "15189-02",
+            "catalog_code": "",
+            "price_buy_gross": "",
+            "price_buy_net": "58.5",
+        }
+
+        variation = row_to_variation(row, mappings_idx)
+
+        self.assertEqual(variation, {"article_number": "15189-02", "price_buy_net": 58.5})
+
+    def test_row_to_variation_reuses_precompiled_plan(self) -> None:
+        """
+        A plan compiled once can be reused for every row with the same keys;
+        a plan compiled for other keys is rejected.
+        """
+        mappings_idx = {
+            ("season",): {
+                "winter": ("season", "Winter"),
+            }
+        }
+        plan = compile_mapping_plan(mappings_idx, ["brand", "article_number", "season"])
+
+        rows = [
+            {"brand": "Via Vai", "article_number": "15189-02", "season": "winter"},
+            {"brand": "Via Vai", "article_number": "15189-03", "season": "summer"},
+        ]
+
+        self.assertEqual(
+            [row_to_variation(row, mappings_idx, plan) for row in rows],
+            [row_to_variation(row, mappings_idx) for row in rows],
+        )
+
+        with self.assertRaises(ValueError):
+            row_to_variation({"season": "winter"}, mappings_idx, plan)
+
     def test_row_to_variation_numeric_conversion(self) -> None:
         """
         Known numeric fields should be converted to float when present and parseable.
@@ -178,6 +307,111 @@ class TestTransform(unittest.TestCase):
             # ensure JSON-serializable
             json.dumps(result)
 
+    def test_build_catalog_repeated_mapping_inputs(self) -> None:
+        """
+        Mapping results are reused across rows with the same mapping inputs:
+        - raw (non-mapping) fields still come from each row
+        - a combination without a mapping rule keeps its raw input fields
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pricat_path = os.path.join(tmpdir, "pricat.csv")
+            mappings_path = os.path.join(tmpdir, "mappings.csv")
+
+            write_file(
+                pricat_path,
+                """
+                ean;brand;article_number;size_group_code;size_code;price_sell
+                111;Via Vai;15189-02;EU;38;139.95
+                222;Via Vai;15189-02;EU;38;
+                333;Via Vai;15189-02;EU;43;99.5
+                444;Via Vai;15189-02;EU;38;139.95
+                """,
+            )
+
+            write_file(
+                mappings_path,
+                """
+                source_type;source;destination_type;destination
+                size_group_code|size_code;EU|38;size;European size 38
+                """,
+            )
+
+            mappings_idx = load_mappings_index(mappings_path)
+            result, _ = build_catalog_from_pricat(pricat_path, mappings_idx)
+            variations = result["catalog"]["articles"][0]["variations"]
+
+            self.assertEqual(
+                variations,
+                [
+                    {"size": "European size 38", "ean": "111", "article_number": "15189-02", "price_sell": 139.95},
+                    {"size": "European size 38", "ean": "222", "article_number": "15189-02"},
+                    {"ean": "333", "article_number": "15189-02", "size_group_code": "EU", "size_code": "43",
+                     "price_sell": 99.5},
+                    {"size": "European size 38", "ean": "444", "article_number": "15189-02", "price_sell": 139.95},
+                ],
+            )
+
+    def test_build_catalog_workers_match_sequential(self) -> None:
+        """
+        Sharded (multi-process) build, encoded by the workers, must write the same JSON
+        as the sequential one: articles split across shards are merged back in file order.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pricat_path = os.path.join(tmpdir, "pricat.csv")
+            mappings_path = os.path.join(tmpdir, "mappings.csv")
+
+            write_file(
+                pricat_path,
+                """
+                ean;brand;article_number;season;size_group_code;size_code
+                111;Via Vai;15189-02;winter;EU;38
+                222;Via Vai;15189-02;winter;EU;39
+                333;Via Vai;15189-03;summer;EU;38
+                444;Via Vai;15189-02;winter;EU;40
+                555;Via Vai;15189-04;winter;EU;39
+                """,
+            )
+
+            write_file(
+                mappings_path,
+                """
+                source_type;source;destination_type;destination
+                season;winter;season;Winter
+                size_group_code|size_code;EU|38;size;European size 38
+                """,
+            )
+
+            mappings_idx = load_mappings_index(mappings_path)
+            result, rows_processed = build_catalog_from_pricat(pricat_path, mappings_idx)
+
+            self.assertEqual(len(transform.shard_byte_ranges(pricat_path, 3)), 3)
+
+            for indent in (2, None):
+                expected = io.StringIO()
+                write_catalog_json(result, expected, indent=indent)
+
+                for workers in (2, 3, 10):
+                    with self.subTest(indent=indent, workers=workers):
+                        catalog, shard_rows = transform.build_encoded_catalog(
+                            pricat_path, mappings_idx, indent=indent, workers=workers
+                        )
+                        transform.encoded_validations(catalog, shard_rows)
+
+                        out = io.StringIO()
+                        transform.write_encoded_catalog_json(catalog, out, indent=indent)
+
+                        self.assertEqual(shard_rows, rows_processed)
+                        self.assertEqual(out.getvalue(), expected.getvalue())
+
+    def test_parse_args_rejects_non_positive_workers(self) -> None:
+        base = ["--pricat", "p.csv", "--mappings", "m.csv", "--output", "o.json"]
+
+        self.assertEqual(transform.parse_args(base + ["--workers", "3"]).workers, 3)
+        for value in ("0", "-2", "x"):
+            with self.subTest(value), mock.patch("sys.stderr", io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    transform.parse_args(base + ["--workers", value])
+
     def test_build_catalog_inconsistent_brand_raises(self) -> None:
         """
         The challenge implies brand is consistent across all pricat rows.
@@ -209,6 +443,133 @@ class TestTransform(unittest.TestCase):
             with self.assertRaises(ValueError):
                 build_catalog_from_pricat(pricat_path, mappings_idx)
 
+    def test_read_csv_rows_positional_cells(self) -> None:
+        """
+        Rows come back as lists aligned with the header:
+        - blank lines are skipped
+        - short rows are padded with ""
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "rows.csv")
+
+            write_file(
+                path,
+                """
+                ean;brand;article_number
+                111;Via Vai;15189-02
+
+                222;Via Vai
+                """,
+            )
+
+            fieldnames, rows = read_csv_rows(path)
+
+            self.assertEqual(fieldnames, ["ean", "brand", "article_number"])
+            self.assertEqual(list(rows), [["111", "Via Vai", "15189-02"], ["222", "Via Vai", ""]])
+
+    def test_read_csv_rows_rejects_unsupported_lines(self) -> None:
+        """
+        Lines the positional reader would split wrongly raise ValueError:
+        - quoted fields (a delimiter inside quotes)
+        - more cells than header columns
+        """
+        cases = {
+            "quoted": '1;VV;A;"x;y"\n',
+            "extra cells": "1;VV;A;x;y\n",
+        }
+
+        for name, line in cases.items():
+            with self.subTest(name), tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "rows.csv")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("ean;brand;article_number;material\n2;VV;B;wool\n" + line)
+
+                _, rows = read_csv_rows(path)
+
+                with self.assertRaises(ValueError):
+                    list(rows)
+
+    def test_text_chunks_small_chunk_sizes(self) -> None:
+        """
+        Chunks end on line boundaries whatever chunk_size is:
+        - lines longer than chunk_size come out whole
+        - CRLF is never split and is normalized to LF
+        - multi-byte UTF-8 characters are never cut
+        """
+        lines = ["ean;color", "1;Marrón", "", "22;€ 9,99 – añil", "3;x"]
+
+        for newline in ("\n", "\r\n"):
+            data = newline.join(lines).encode("utf-8")
+            expected = "\n".join(lines)
+
+            for chunk_size in (1, 2, 3):
+                with self.subTest(newline=newline, chunk_size=chunk_size):
+                    chunks = list(transform._text_chunks(data, 0, len(data), chunk_size))
+
+                    self.assertEqual("".join(chunks), expected)
+                    self.assertTrue(all(chunk.endswith("\n") for chunk in chunks[:-1]))
+
+                    with tempfile.TemporaryDirectory() as tmpdir:
+                        path = os.path.join(tmpdir, "rows.csv")
+                        with open(path, "wb") as f:
+                            f.write(data)
+
+                        with mock.patch.object(transform, "READ_CHUNK_BYTES", chunk_size):
+                            fieldnames, rows = read_csv_rows(path)
+                            rows = list(rows)
+
+                    self.assertEqual(fieldnames, ["ean", "color"])
+                    self.assertEqual(rows, [["1", "Marrón"], ["22", "€ 9,99 – añil"], ["3", "x"]])
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+    def test_read_csv_rows_from_pipe(self) -> None:
+        """
+        A non-regular file (e.g. --pricat <(cat pricat.csv)) is read once, without mmap.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "rows.fifo")
+            os.mkfifo(path)
+
+            def feed() -> None:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("ean;brand;article_number\r\n111;Via Vai;15189-02\r\n222;Via Vai\r\n")
+
+            writer = threading.Thread(target=feed)
+            writer.start()
+            try:
+                fieldnames, rows = read_csv_rows(path)
+                rows = list(rows)
+            finally:
+                writer.join()
+
+            self.assertEqual(fieldnames, ["ean", "brand", "article_number"])
+            self.assertEqual(rows, [["111", "Via Vai", "15189-02"], ["222", "Via Vai", ""]])
+
+    def test_write_catalog_json_matches_json_dump(self) -> None:
+        """
+        Streaming writer must produce the same text as json.dump (indented and compact),
+        including values that look like JSON punctuation, empty and nested variations.
+        """
+        result = {
+            "catalog": {
+                "brand": "Via Vai",
+                "articles": [
+                    {"article_number": "15189-02", "variations": [{"size": "European size 38", "price_sell": 139.95}]},
+                    {"article_number": "15189-03", "variations": [{"color": "Brandy Nero"}, {"material": "},{"}]},
+                    {"article_number": "15189-04", "variations": [{}]},
+                    {"article_number": "15189-05", "variations": [{"a": [1, 2]}, {"a": {"x": 1}}]},
+                    {"article_number": "15189-06", "variations": [{"a": [{"x": 1}, {"y": 2}]}]},
+                ],
+            }
+        }
+        empty = {"catalog": {"brand": "", "articles": []}}
+
+        for data in (result, empty):
+            for indent in (2, None):
+                buf = io.StringIO()
+                write_catalog_json(data, buf, indent=indent)
+                self.assertEqual(buf.getvalue(), json.dumps(data, ensure_ascii=False, indent=indent))
+
     def test_combine_fields_bonus(self) -> None:
         from src.transform import parse_combine_specs, apply_combine_specs
 